@@ -0,0 +1,59 @@
+"""Ressources statiques de la page (logo, CSS du thème).
+
+Préparées une fois par processus (``lru_cache``) : chaque rerun réutilise la
+même chaîne au lieu de relire, réencoder et renvoyer les octets bruts.
+"""
+import base64
+import io
+import os
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+try:  # Pillow est une dépendance de Streamlit ; sans lui, logo non redimensionné
+    from PIL import Image
+except ImportError:  # pragma: no cover
+    Image = None
+
+
+# =========================
+# LOGO
+# =========================
+LOGO_HEIGHT = 56  # hauteur affichée (px)
+
+def _thumbnail_png(path: str, height: int) -> bytes:
+    """PNG réduit à ``height`` px de haut (x2 pour les écrans haute densité)."""
+    with open(path, "rb") as f:
+        raw = f.read()
+    if Image is None:
+        return raw
+    with Image.open(io.BytesIO(raw)) as im:
+        im.thumbnail((im.width, height * 2))
+        out = io.BytesIO()
+        im.save(out, format="PNG", optimize=True)
+    return out.getvalue() if out.tell() < len(raw) else raw
+
+@lru_cache(maxsize=8)
+def logo_data_uri(paths: Tuple[str, ...], height: int = LOGO_HEIGHT) -> Optional[str]:
+    """URI data: du premier logo trouvé, redimensionné et encodé une seule fois."""
+    for p in paths:
+        if os.path.exists(p):
+            b64 = base64.b64encode(_thumbnail_png(p, height)).decode("ascii")
+            return f"data:image/png;base64,{b64}"
+    return None
+
+
+# =========================
+# CSS
+# =========================
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+
+@lru_cache(maxsize=8)
+def minify_css(css: str) -> str:
+    """Retire commentaires et blancs superflus (mémoïsé : même entrée, même sortie
+    à l'octet près, donc réutilisable par le cache de messages du navigateur)."""
+    css = _CSS_COMMENT_RE.sub("", css)
+    css = _CSS_SPACE_RE.sub(" ", css)
+    return _CSS_PUNCT_RE.sub(r"\1", css).replace(";}", "}").strip()
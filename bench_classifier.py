@@ -0,0 +1,83 @@
+"""Benchmark : classifieur compilé (catalog.SubjectClassifier) vs l'ancienne
+suite de ``re.search`` de ``classify_subject``.
+
+    python bench_classifier.py [nb_titres]
+"""
+import random
+import re
+import sys
+import time
+
+from catalog import SUBJECT_RULES, UNKNOWN_SUBJECT, SubjectClassifier, get_catalog
+
+
+def classify_subject_legacy(raw_title: str) -> str:
+    """Ancienne implémentation (une regex non compilée par règle)."""
+    t = raw_title.upper()
+
+    if re.search(r'^BIOCHIMIE\s+\d+', t): return "Biochimie"
+    if re.search(r'^CHIMIE\s+\d+', t): return "Chimie"
+    if re.search(r'^BIOLOGIE\s+\d+', t): return "Biologie cellulaire"
+    if re.search(r'^BIOPHYSIQUE\s+\d+', t): return "Biophysique"
+    if re.search(r'^STATISTIQUES\s+\d+', t): return "Statistiques"
+
+    if re.search(r'CELLULE|MEMBRANE|MITOCHONDRIE|NOYAU|CYTOSQUELETTE|CYCLE\s+CELLULAIRE|APOPTOSE|COMMUNICATION\s+INTERCELLULAIRE|TRAFIC\s+INTRACELLULAIRE|ENDO.*EXOCYTOSE|JONCTIONS|INTEGRINES|MATRICE\s+EXTRACELLULAIRE|DEVELOPPEMENT', t):
+        return "Biologie cellulaire"
+
+    if re.search(r'ETHIQUE|SANTE|ENVIRONNEMENT|MEDECINE|PRESCRIPTION|MEDICAMENT|RECHERCHE|COMMERCIALISATION|MALADIES\s+CHRONIQUES|GENETIQUE|IVG|SECRET\s+PROFESSIONNEL|RESPONSABILITE\s+PROFESSIONNELLE|FIN\s+DE\s+VIE|EPIDEMIES|SANTE\s+PUBLIQUE|INEQUALITES\s+SOCIALES|TRAVAIL', t):
+        return "SHS"
+
+    if re.search(r'^PHYSIQUE\s+\d+', t): return "Physique"
+    if re.search(r'^HISTO.*EMBRYO\s+\d+', t): return "Biologie cellulaire"
+    if re.search(r'^MATHS.*BIOSTATS\s+\d+', t): return "Statistiques"
+    if re.search(r'^SANTE\s+PUBLIQUE\s+\d+', t): return "Santé publique"
+
+    if re.search(r'BIO.*CELL.*HISTO.*EMBRYO', t): return "Biologie cellulaire"
+    if re.search(r'CHIMIE.*BIOCHIMIE', t): return "Chimie"
+    if re.search(r'PHYSIQUE.*BIOPHYSIQUE', t): return "Physique"
+
+    return UNKNOWN_SUBJECT
+
+
+def synthetic_titles(n: int, seed: int = 42):
+    """Titres réels du catalogue, renumérotés et bruités."""
+    rng = random.Random(seed)
+    base = [c.title for fac in get_catalog().data.values()
+            for week_map in fac.values() for items in week_map.values() for c in items]
+    extra = ["Maths biostats", "Santé publique", "Histo embryo", "Physique", "Cours libre"]
+    out = []
+    for _ in range(n):
+        t = rng.choice(base + extra)
+        t = re.sub(r"\d+", "", t).strip()
+        out.append(f"{t} {rng.randint(1, 60)}")
+    return out
+
+
+def bench(label: str, fn, titles) -> float:
+    t0 = time.perf_counter()
+    for t in titles:
+        fn(t)
+    dt = time.perf_counter() - t0
+    print(f"{label:<28} {dt * 1000:9.1f} ms  {len(titles) / dt:12,.0f} titres/s")
+    return dt
+
+
+def main(n: int = 200_000):
+    titles = synthetic_titles(n)
+    print(f"{n} titres synthétiques ({len(set(titles))} distincts)")
+
+    clf = SubjectClassifier(SUBJECT_RULES, UNKNOWN_SUBJECT)
+    mismatches = [t for t in set(titles) if clf(t) != classify_subject_legacy(t)]
+    if mismatches:
+        print(f"ERREUR : {len(mismatches)} titres classés différemment, ex. {mismatches[:3]}")
+        sys.exit(1)
+
+    legacy = bench("ancien (re.search x15)", classify_subject_legacy, titles)
+    uncached = SubjectClassifier(SUBJECT_RULES, UNKNOWN_SUBJECT, cache_size=0)
+    compiled = bench("compilé, sans cache", uncached, titles)
+    memo = bench("compilé + mémoïsation", SubjectClassifier(SUBJECT_RULES, UNKNOWN_SUBJECT), titles)
+    print(f"gain : x{legacy / compiled:.1f} (compilé), x{legacy / memo:.1f} (mémoïsé)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200_000)
@@ -0,0 +1,56 @@
+"""Rendu HTML des cartes de cours.
+
+Module importé (contrairement à app.py, réexécuté à chaque rerun) : les caches
+``lru_cache`` y vivent pour tout le processus et sont partagés entre sessions.
+"""
+import html
+import re
+from functools import lru_cache
+
+from catalog import Course
+
+
+# =========================
+# CLÉS DE PROGRESSION
+# =========================
+_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+@lru_cache(maxsize=None)
+def make_key(*parts: str) -> str:
+    """Clé de progression ``ds::fac::matiere::semaine::id`` (format stable)."""
+    return "ds::" + "::".join(_SLUG_RE.sub("_", p.lower()) for p in parts if p)
+
+
+# =========================
+# CARTES
+# =========================
+THEME = "ds-dark"
+
+CELL_CLASSES = {
+    "UPC": "cell-upc",
+    "UPS": "cell-ups",
+    "UVSQ": "cell-uvsq",
+    "L1 UPEC": "cell-l1-upec",
+    "L2 UPEC": "cell-l2-upec",
+    "USPN": "cell-uspn",
+    "SU": "cell-su",
+}
+DEFAULT_CELL_CLASS = "cell-upc"
+
+def cell_class(fac: str) -> str:
+    return CELL_CLASSES.get(fac, DEFAULT_CELL_CLASS)
+
+
+@lru_cache(maxsize=8192)
+def card_html(fac: str, c: Course, done: bool, theme: str = THEME) -> str:
+    """HTML statique d'une carte (titre, date, matières, état), calculé une fois
+    par (cours, état coché, thème) ; le cours (immuable) porte son id, et un
+    cours modifié par rechargement à chaud obtient donc sa propre entrée."""
+    return (
+        f'<div class="cell {cell_class(fac)} course-block" data-theme="{theme}">'
+        f"<strong>{html.escape(c.title, quote=False)}</strong><br>"
+        f'<span class="mini">{html.escape(c.date, quote=False)}</span><br>'
+        f'<span class="mini subject">{html.escape(c.subjects_label, quote=False)}</span>'
+        f"<span class='ok-pill'>{'OK' if done else 'À faire'}</span>"
+        "</div>"
+    )
@@ -0,0 +1,967 @@
+"""Catalogue des cours (toutes facultés).
+
+Les emplois du temps bruts sont dans data/*.csv (un fichier par faculté) ou
+dans un module faculties/<faculté>.py ; chaque faculté est compilée à sa
+première demande (résultat mis en cache dans data/.cache) puis partagée en
+lecture seule entre toutes les sessions Streamlit (voir ``get_catalog``).
+"""
+import csv
+import hashlib
+import importlib
+import io
+import marshal
+import os
+import re
+import sys
+import threading
+import time
+import unicodedata
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from typing import Callable, Dict, List, NamedTuple, Optional, Set, Tuple
+
+
+# =========================
+# UTILS
+# =========================
+def monday_of(d: date) -> date:
+    return d - timedelta(days=d.weekday())
+
+def week_label_for(d: date) -> str:
+    m = monday_of(d)
+    s = m.strftime("%d/%m/%Y")
+    e = (m + timedelta(days=6)).strftime("%d/%m/%Y")
+    return f"{s} - {e}"
+
+
+def parse_fr_date(dstr: str) -> date:
+    return datetime.strptime(dstr, "%d/%m/%Y").date()
+
+_HOUR_RE = re.compile(r"^\s*(\d{1,2})\s*h\s*(\d{2})?\s*$")
+
+def parse_fr_hour(hstr: Optional[str]) -> Optional[int]:
+    """ "8h15" -> 495 (minutes depuis minuit) ; None si absent/illisible."""
+    m = _HOUR_RE.match(hstr or "")
+    if not m:
+        return None
+    return int(m.group(1)) * 60 + int(m.group(2) or 0)
+
+
+# =========================
+# CALENDRIER : semaines ISO en entiers (AAAASS), libellés pour l'affichage
+# =========================
+def week_key(d: date) -> int:
+    """2025-09-08 -> 202537 (année ISO * 100 + semaine ISO) ; ordre chronologique."""
+    y, w, _ = d.isocalendar()
+    return y * 100 + w
+
+def week_monday(key: int) -> date:
+    return date.fromisocalendar(key // 100, key % 100, 1)
+
+@lru_cache(maxsize=None)
+def week_label(key: int) -> str:
+    return week_label_for(week_monday(key))
+
+def week_key_from_label(label: str) -> int:
+    return week_key(parse_fr_date(label.split(" - ")[0]))
+
+def weeks_between(start: date, end_included: date) -> List[int]:
+    """Toutes les semaines de start à end_included (chevauchement d'année ISO géré)."""
+    out = []
+    cur = monday_of(start)
+    while cur <= end_included:
+        out.append(week_key(cur))
+        cur += timedelta(days=7)
+    return out
+
+def academic_year_bounds(d: date) -> Tuple[date, date]:
+    """Année universitaire contenant d : 1er septembre -> 31 août."""
+    y = d.year if d.month >= 9 else d.year - 1
+    return date(y, 9, 1), date(y + 1, 8, 31)
+
+def default_week(populated: List[int], today: date) -> int:
+    """Semaine courante si elle a des cours, sinon la prochaine semaine remplie
+    (bisect sur les semaines triées), sinon la dernière."""
+    cur = week_key(today)
+    if not populated:
+        return cur
+    i = bisect_left(populated, cur)
+    return populated[i] if i < len(populated) else populated[-1]
+
+def calendar_weeks(populated: List[int], today: date) -> List[int]:
+    """Semaines proposées : de la première à la dernière semaine remplie,
+    ou l'année universitaire en cours si le catalogue est vide."""
+    if not populated:
+        return weeks_between(*academic_year_bounds(today))
+    return weeks_between(week_monday(populated[0]), week_monday(populated[-1]))
+
+
+# =========================
+# CLASSIFICATION MATIÈRES
+# =========================
+COMMON_HINTS = {
+    "Biologie cellulaire",
+    "Histologie",
+    "Embryologie",
+    "Chimie",
+    "Biochimie", 
+    "Physique",
+    "Biophysique",
+    "Statistiques",
+    "SHS",
+    "Santé publique",
+    "BDD",
+    "BDR",
+    "Anatomie",
+    "UEDS",
+    "UEDL",
+    "De l'atome aux molécules",
+    "Humanités en santé",
+    "Environnement urbain et santé",
+    "Fondements philosophiques de l'éthique médicale",
+    "Droit et santé",
+}
+UNKNOWN_SUBJECT = "CM inconnus"
+
+# Règles (motif sur le titre en MAJUSCULES, matière), par ordre de priorité :
+# la première qui correspond l'emporte.
+SUBJECT_RULES: List[Tuple[str, str]] = [
+    # Classification précise basée sur les noms réels des cours
+    (r'^BIOCHIMIE\s+\d+', "Biochimie"),
+    (r'^CHIMIE\s+\d+', "Chimie"),
+    (r'^BIOLOGIE\s+\d+', "Biologie cellulaire"),
+    (r'^BIOPHYSIQUE\s+\d+', "Biophysique"),
+    (r'^STATISTIQUES\s+\d+', "Statistiques"),
+    # Pour les cours UPC avec noms descriptifs
+    (r'CELLULE|MEMBRANE|MITOCHONDRIE|NOYAU|CYTOSQUELETTE|CYCLE\s+CELLULAIRE|APOPTOSE|COMMUNICATION\s+INTERCELLULAIRE|TRAFIC\s+INTRACELLULAIRE|ENDO.*EXOCYTOSE|JONCTIONS|INTEGRINES|MATRICE\s+EXTRACELLULAIRE|DEVELOPPEMENT',
+     "Biologie cellulaire"),
+    (r'ETHIQUE|SANTE|ENVIRONNEMENT|MEDECINE|PRESCRIPTION|MEDICAMENT|RECHERCHE|COMMERCIALISATION|MALADIES\s+CHRONIQUES|GENETIQUE|IVG|SECRET\s+PROFESSIONNEL|RESPONSABILITE\s+PROFESSIONNELLE|FIN\s+DE\s+VIE|EPIDEMIES|SANTE\s+PUBLIQUE|INEQUALITES\s+SOCIALES|TRAVAIL',
+     "SHS"),
+    (r'^PHYSIQUE\s+\d+', "Physique"),
+    (r'^HISTO.*EMBRYO\s+\d+', "Biologie cellulaire"),
+    (r'^MATHS.*BIOSTATS\s+\d+', "Statistiques"),
+    (r'^SANTE\s+PUBLIQUE\s+\d+', "Santé publique"),
+    # Fallback pour les noms composés UVSQ
+    (r'BIO.*CELL.*HISTO.*EMBRYO', "Biologie cellulaire"),
+    (r'CHIMIE.*BIOCHIMIE', "Chimie"),
+    (r'PHYSIQUE.*BIOPHYSIQUE', "Physique"),
+]
+
+
+class SubjectClassifier:
+    """Toutes les règles compilées en une seule regex, résultats mémoïsés.
+
+    Chaque règle devient une alternative ``(?=(?P<rN>...))`` testée à la
+    position 0 : l'alternance respecte l'ordre des règles, donc un seul
+    ``match`` renvoie la première règle qui correspond, comme l'ancienne
+    suite de ``re.search``.
+    """
+
+    def __init__(self, rules: List[Tuple[str, str]], default: str, cache_size: int = 4096):
+        branches = []
+        for i, (pattern, _subject) in enumerate(rules):
+            body = pattern[1:] if pattern.startswith("^") else f".*?(?:{pattern})"
+            branches.append(f"(?=(?P<r{i}>{body}))")
+        self._regex = re.compile("|".join(branches), re.DOTALL)
+        self._subjects = {f"r{i}": subject for i, (_p, subject) in enumerate(rules)}
+        self._default = default
+        self.classify = lru_cache(maxsize=cache_size)(self._classify)
+
+    def _classify(self, raw_title: str) -> str:
+        m = self._regex.match(raw_title.upper())
+        return self._subjects[m.lastgroup] if m else self._default
+
+    def __call__(self, raw_title: str) -> str:
+        return self.classify(raw_title)
+
+
+_CLASSIFIER = SubjectClassifier(SUBJECT_RULES, UNKNOWN_SUBJECT)
+
+def classify_subject(raw_title: str) -> str:
+    """Classification basée sur le nom exact du cours"""
+    return _CLASSIFIER(raw_title)
+
+# =========================
+# CORRESPONDANCES UE / libellé -> matière (tables déclaratives)
+# =========================
+class UEMapping(NamedTuple):
+    subject: str        # matière (clé de regroupement)
+    title_prefix: str   # titre affiché = "<prefix> <numéro>"
+    all_subjects: str   # matières étendues (affichage + recherche)
+
+
+# SU : code UE -> matière
+SU_UE_MAP: Dict[str, UEMapping] = {
+    "UE1": UEMapping("Chimie", "Chimie, Biochimie", "Chimie, Biochimie"),
+    "UE2": UEMapping("Biologie cellulaire", "Biologie cellulaire, Histologie, BDD, BDR",
+                     "Biologie cellulaire, Histologie, BDD, BDR"),
+    "UE5": UEMapping("Anatomie", "Anatomie", "Anatomie"),
+    "UEDS": UEMapping("UEDS", "UEDS", "UEDS"),
+    "UEDL": UEMapping("UEDL", "UEDL", "UEDL"),
+}
+
+# UPS : premier mot du libellé (minuscules) -> matière
+UPS_LABEL_MAP: Dict[str, str] = {
+    "biologie": "Biologie cellulaire",
+    "biophysique": "Biophysique",
+    "chimie": "Chimie",
+    "biochimie": "Biochimie",
+    "statistiques": "Statistiques",
+    "consignes": UNKNOWN_SUBJECT,
+}
+
+# UPEC (L1/L2) : UE -> matière affichée ; par défaut l'UE elle-même
+UPEC_UE_MAP: Dict[str, str] = {}
+
+
+def map_ue(table: Dict[str, UEMapping], ue: str) -> UEMapping:
+    """Une seule recherche par ligne ; UE inconnue -> "CM inconnus"."""
+    m = table.get(ue)
+    return m if m is not None else UEMapping(UNKNOWN_SUBJECT, ue, ue)
+
+
+def normalize_from_ups(label: str) -> str:
+    """Normalisation pour UPS - utilise le premier mot du label"""
+    words = label.split()
+    return UPS_LABEL_MAP.get(words[0].lower(), UNKNOWN_SUBJECT) if words else UNKNOWN_SUBJECT
+
+# =========================
+# UVSQ (CM only) + S12 ajoutée (résumé à partir de tes captures)
+# =========================
+def add_item(dst: Dict[str, Dict[str, List[Dict]]], week_label: str,
+             title: str, date_str: str, explicit_subject: Optional[str]=None, cid: Optional[str]=None):
+    subj = explicit_subject or classify_subject(title)
+    dst.setdefault(week_label, {}).setdefault(subj, []).append({
+        "id": cid or f"{title}@{date_str}", "title": title, "date": date_str,
+    })
+
+
+# =========================
+# COMPILATION des fichiers data/*.csv -> semaine -> matière -> cours
+# =========================
+Weeks = Dict[str, Dict[str, List[Dict]]]
+Rows = List[Dict[str, str]]
+
+def course_id(prefix: str, subject: str, title: str, d: date) -> str:
+    """ID stable : ne pas changer le format (clés de progression)."""
+    safe_subj = re.sub(r'[^a-z0-9]+', '_', subject.lower())
+    safe_title = re.sub(r'[^a-z0-9]+', '_', title.lower())
+    return f"{prefix}-{safe_subj}-{safe_title}-{d.strftime('%Y%m%d')}"
+
+def _chronological(rows: Rows) -> Rows:
+    # Tri stable : à date égale, l'ordre du fichier est conservé
+    return sorted(rows, key=lambda r: parse_fr_date(r["date"]))
+
+
+# =========================
+# UPS — data/ups.csv : date, libelle, debut, fin
+# =========================
+def compile_ups(rows: Rows) -> Weeks:
+    out: Weeks = {}
+    for r in _chronological(rows):
+        d = parse_fr_date(r["date"])
+        wlab = week_label_for(d)
+        label = r["libelle"]
+
+        # Sujet normalisé (fusion avec UVSQ)
+        subject = normalize_from_ups(label)  # table UPS_LABEL_MAP ("Consignes concours" -> inconnus)
+
+        # Titre affiché avec horaires
+        h1, h2 = r.get("debut"), r.get("fin")
+        time_suffix = f" — {h1}–{h2}" if (h1 and h2) else ""
+        title = f"{label}{time_suffix}"
+
+        out.setdefault(wlab, {}).setdefault(subject, []).append({
+            "id": course_id("UPS", subject, label, d),
+            "title": title,
+            "date": d.strftime("%d/%m/%Y"),
+            "ordinal": d.toordinal(),
+            "start": parse_fr_hour(h1),
+        })
+    return out
+
+
+# =========================
+# UPC — data/upc.csv : date, groupe, titre
+# =========================
+# groupe -> matière ; None = selon le titre (Chimie / Biochimie)
+UPC_GROUPS: Dict[str, Optional[str]] = {
+    "bio": "Biologie cellulaire",
+    "shs": "SHS",
+    "phys": "Physique",
+    "cb": None,
+    "stats": "Statistiques",
+    "sp": "Santé publique",
+}
+
+def compile_upc(rows: Rows) -> Weeks:
+    groups = list(UPC_GROUPS)
+    groups += [g for g in dict.fromkeys(r["groupe"] for r in rows) if g not in UPC_GROUPS]
+
+    out: Weeks = {}
+    for group in groups:
+        fixed_subject = UPC_GROUPS.get(group)
+        for r in _chronological([r for r in rows if r["groupe"] == group]):
+            d = parse_fr_date(r["date"])
+            wlab = week_label_for(d)
+            title = r["titre"]
+            subject = fixed_subject or classify_subject(title)
+            out.setdefault(wlab, {}).setdefault(subject, []).append({
+                "id": course_id("UPC", subject, title, d),
+                "title": title,
+                "date": d.strftime("%d/%m/%Y"),
+                "ordinal": d.toordinal(),
+            })
+    return out
+
+
+# =========================
+# UVSQ — data/uvsq.csv : date, titre
+# =========================
+def subject_short_name(subject: str) -> str:
+    if subject == "Biologie cellulaire":
+        return "Biocell - Histo - Embryo"
+    if subject == "Chimie":
+        return "Chimie - Biochimie"
+    if subject == "Physique":
+        return "Physique - Biophysique"
+    return "CM inconnu"
+
+def compile_uvsq(rows: Rows) -> Weeks:
+    out: Weeks = {}
+    for r in _chronological(rows):
+        d = parse_fr_date(r["date"])
+        wlab = week_label_for(d)
+        title = r["titre"]
+
+        # Classification des matières
+        subject = classify_subject(title)
+
+        out.setdefault(wlab, {}).setdefault(subject, []).append({
+            "id": course_id("UVSQ", subject, title, d),
+            "title": title,
+            "date": d.strftime("%d/%m/%Y"),
+            "ordinal": d.toordinal(),
+        })
+    return out
+
+
+# =========================
+# SU — data/su.csv : date, ue, numero, note
+# =========================
+def compile_su(rows: Rows) -> Weeks:
+    out: Weeks = {}
+    for r in _chronological(rows):
+        d = parse_fr_date(r["date"])
+        wlab = week_label_for(d)
+
+        # Conversion UE vers matières
+        mapping = map_ue(SU_UE_MAP, r["ue"])
+        subject = mapping.subject
+        title = f"{mapping.title_prefix} {int(r['numero'])}"
+
+        out.setdefault(wlab, {}).setdefault(subject, []).append({
+            "id": course_id("SU", subject, title, d),
+            "title": title,
+            "date": d.strftime("%d/%m/%Y"),
+            "ordinal": d.toordinal(),
+            "all_subjects": mapping.all_subjects,
+        })
+    return out
+
+
+# =========================
+# UPEC L1 — data/upec_l1.csv : date, ue, cours, enseignant
+# =========================
+def compile_upec_l1(rows: Rows) -> Weeks:
+    out: Weeks = {}
+    for r in _chronological(rows):
+        d = parse_fr_date(r["date"])
+        wlab = week_label_for(d)
+
+        # Utiliser l'UE comme matière
+        subject = UPEC_UE_MAP.get(r["ue"], r["ue"])
+        title = r["cours"]
+
+        # Date : "-" pour tous sauf "Droit et santé" qui garde sa date précise
+        if subject == "Droit et santé":
+            display_date = d.strftime("%d/%m/%Y")
+        else:
+            display_date = "-"
+
+        out.setdefault(wlab, {}).setdefault(subject, []).append({
+            "id": course_id("UPEC-L1", subject, title, d),
+            "title": title,
+            "date": display_date,
+            "ordinal": d.toordinal(),
+            "all_subjects": subject,  # Pour la recherche
+            "teacher": r["enseignant"],
+        })
+    return out
+
+
+# =========================
+# UPEC L2 — data/upec_l2.csv : date, matiere
+# =========================
+def compile_upec_l2(rows: Rows) -> Weeks:
+    # Compter les occurrences de chaque matière pour la numérotation des CM
+    subject_counts: Dict[str, int] = {}
+
+    out: Weeks = {}
+    for r in _chronological(rows):
+        d = parse_fr_date(r["date"])
+        wlab = week_label_for(d)
+        subject = UPEC_UE_MAP.get(r["matiere"], r["matiere"])
+
+        subject_counts[subject] = subject_counts.get(subject, 0) + 1
+        # Créer le titre avec numérotation automatique
+        title = f"{subject} CM {subject_counts[subject]}"
+
+        out.setdefault(wlab, {}).setdefault(subject, []).append({
+            "id": course_id("UPEC-L2", subject, title, d),
+            "title": title,
+            "date": d.strftime("%d/%m/%Y"),
+            "ordinal": d.toordinal(),
+            "all_subjects": subject,  # Pour la recherche
+        })
+    return out
+
+
+# =========================
+# CHARGEMENT : CSV -> cache binaire (marshal) indexé par empreinte
+# =========================
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+CACHE_DIR = os.path.join(DATA_DIR, ".cache")
+
+
+class FacultySource(NamedTuple):
+    filename: str
+    compile: Callable[[Rows], Weeks]
+
+
+SOURCES: Dict[str, FacultySource] = {
+    "UPC": FacultySource("upc.csv", compile_upc),
+    "UPS": FacultySource("ups.csv", compile_ups),
+    "UVSQ": FacultySource("uvsq.csv", compile_uvsq),
+    "L1 UPEC": FacultySource("upec_l1.csv", compile_upec_l1),
+    "L2 UPEC": FacultySource("upec_l2.csv", compile_upec_l2),
+    "SU": FacultySource("su.csv", compile_su),
+}
+
+
+def _compiler_fingerprint() -> bytes:
+    """Le code de compilation fait partie de la clé : le modifier invalide le cache."""
+    h = hashlib.sha256(f"{sys.version_info[:2]}|marshal{marshal.version}|".encode())
+    try:
+        with open(__file__, "rb") as f:
+            h.update(f.read())
+    except OSError:
+        pass
+    return h.digest()
+
+_COMPILER_FINGERPRINT = _compiler_fingerprint()
+
+
+def read_rows(raw: bytes) -> Rows:
+    return list(csv.DictReader(io.StringIO(raw.decode("utf-8"))))
+
+
+def load_faculty(fac: str) -> Weeks:
+    """Semaines d'une faculté : depuis le cache si le CSV n'a pas changé."""
+    src = SOURCES.get(fac)
+    if src is None:
+        return {}
+    with open(os.path.join(DATA_DIR, src.filename), "rb") as f:
+        raw = f.read()
+    key = hashlib.sha256(_COMPILER_FINGERPRINT + raw).hexdigest()[:16]
+    stem = os.path.splitext(src.filename)[0]
+    cache_path = os.path.join(CACHE_DIR, f"{stem}-{key}.marshal")
+
+    try:
+        with open(cache_path, "rb") as f:
+            return marshal.load(f)
+    except (OSError, EOFError, ValueError, TypeError):
+        pass
+
+    weeks = src.compile(read_rows(raw))
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        tmp = f"{cache_path}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            marshal.dump(weeks, f)
+        os.replace(tmp, cache_path)
+        # anciennes versions de ce fichier
+        for name in os.listdir(CACHE_DIR):
+            if name.startswith(f"{stem}-") and name.endswith(".marshal") and name != os.path.basename(cache_path):
+                os.remove(os.path.join(CACHE_DIR, name))
+    except OSError:
+        pass  # disque en lecture seule : on garde le résultat en mémoire
+    return weeks
+
+
+# =========================
+# DATA GLOBALE
+# =========================
+FACULTIES = ["UPC", "UPS", "UVSQ", "L1 UPEC", "L2 UPEC", "USPN", "SU"]
+
+# =========================
+# TRI des matières par fréquence (desc), "CM inconnus" en bas
+# =========================
+def subjects_sorted_by_frequency(data: Dict[str, Dict[str, Dict[str, List[Dict]]]]) -> List[str]:
+    counts: Dict[str, int] = {}
+    for fac_weeks in data.values():
+        for week_map in fac_weeks.values():
+            for subj, items in week_map.items():
+                counts[subj] = counts.get(subj, 0) + len(items)
+
+    # garantir présence si vide au départ
+    for subj in list(COMMON_HINTS) + [UNKNOWN_SUBJECT]:
+        counts.setdefault(subj, 0)
+
+    # tri : inconnus tout en bas, sinon par fréquence décroissante puis alpha
+    def sort_key(s: str):
+        if s == UNKNOWN_SUBJECT: return (1, 0, s.lower())
+        return (0, -counts.get(s, 0), s.lower())
+
+    return sorted(counts.keys(), key=sort_key)
+
+# =========================
+# COURS compacts : tuples immuables, matière/faculté internées en entiers
+# =========================
+class Interner:
+    """Nom <-> petit entier, partagé par tout le processus."""
+
+    def __init__(self, names: Optional[List[str]] = None):
+        self._ids: Dict[str, int] = {}
+        self._names: List[str] = []
+        self._lock = threading.Lock()
+        for name in names or []:
+            self.id(name)
+
+    def id(self, name: str) -> int:
+        i = self._ids.get(name)
+        if i is None:
+            with self._lock:
+                i = self._ids.get(name)
+                if i is None:
+                    i = len(self._names)
+                    self._names.append(sys.intern(name))
+                    self._ids[name] = i
+        return i
+
+    def name(self, i: int) -> str:
+        return self._names[i]
+
+
+SUBJECT_IDS = Interner()
+FACULTY_IDS = Interner(FACULTIES)
+
+
+class Course(NamedTuple):
+    id: str
+    title: str
+    date: str             # date affichée "dd/mm/YYYY" ou "-"
+    ordinal: int          # date réelle (date.toordinal)
+    week: int             # voir week_key (AAAASS)
+    sort_key: int         # ordinal * 1440 + heure de début (min), ordre des colonnes
+    subject: int          # SUBJECT_IDS
+    faculty: int          # FACULTY_IDS
+    all_subjects: str     # "" si absent
+    teacher: str          # "" si absent
+
+    @property
+    def subject_name(self) -> str:
+        return SUBJECT_IDS.name(self.subject)
+
+    @property
+    def faculty_name(self) -> str:
+        return FACULTY_IDS.name(self.faculty)
+
+    @property
+    def subjects_label(self) -> str:
+        """Matières étendues si disponibles, sinon la matière principale."""
+        return self.all_subjects or self.subject_name
+
+    @property
+    def has_date(self) -> bool:
+        return self.date != "-"
+
+
+MINUTES_PER_DAY = 24 * 60
+
+def make_course(it: Dict, subject: int, faculty: int, week: int) -> Course:
+    ordinal = it.get("ordinal") or parse_fr_date(it["date"]).toordinal()
+    sort_key = ordinal * MINUTES_PER_DAY + (it.get("start") or 0)
+    return Course(it["id"], it["title"], sys.intern(it["date"]), ordinal, week, sort_key,
+                  subject, faculty,
+                  sys.intern(it.get("all_subjects", "")), sys.intern(it.get("teacher", "")))
+
+# =========================
+# INDEX semaine -> [cours] déjà triés (par faculté)
+# =========================
+WeekIndex = Dict[int, List[Course]]
+
+def build_week_index(fac: str, weeks: Weeks, subjects: List[str]) -> WeekIndex:
+    faculty = FACULTY_IDS.id(fac)
+    index: WeekIndex = {}
+    for wlab, week_map in weeks.items():
+        w = week_key_from_label(wlab)
+        courses = [make_course(it, SUBJECT_IDS.id(subj), faculty, w)
+                   for subj in subjects for it in week_map.get(subj, [])]
+        # Chronologique (date réelle + heure) ; à égalité, ordre des matières
+        courses.sort(key=lambda c: c.sort_key)
+        index[w] = courses
+    return index
+
+# =========================
+# INDEX par jour : ordinal -> [cours] (par faculté)
+# =========================
+DayIndex = Dict[int, List[Course]]
+
+def build_day_index(week_index: WeekIndex) -> DayIndex:
+    """Les cours sans date affichée ("-", UPEC L1) ne sont pas indexés."""
+    index: DayIndex = {}
+    for courses in week_index.values():
+        for c in courses:
+            if c.has_date:
+                index.setdefault(c.ordinal, []).append(c)
+    return index
+
+# =========================
+# RECHERCHE : index inversé (tokens + préfixes)
+# =========================
+_TOKEN_RE = re.compile(r"\w+")
+SEARCH_FIELDS = ("title", "all_subjects", "teacher")
+FUZZY_THRESHOLD = 0.25  # tolère une inversion de lettres dans un mot de 6
+
+SearchEntry = Course
+
+def fold(text: str) -> str:
+    """Sans accents ni casse : "Santé" -> "sante"."""
+    text = unicodedata.normalize("NFKD", text)
+    return "".join(ch for ch in text if not unicodedata.combining(ch)).casefold()
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(fold(text))
+
+def trigrams(word: str) -> Set[str]:
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SearchIndex:
+    """Titre, matière, matières étendues et enseignant -> entrées du catalogue.
+
+    Tokens et trigrammes sont calculés une fois, sur le texte replié
+    (sans accents ni casse) : seule la requête est repliée à la frappe.
+
+    Les entrées sont numérotées dans l'ordre chronologique des colonnes :
+    un résultat trié par numéro est donc directement affichable.
+    """
+
+    def __init__(self, entries: List[SearchEntry]):
+        self.entries = entries
+        postings: Dict[str, Set[int]] = {}
+        for n, c in enumerate(entries):
+            texts = [c.subject_name] + [getattr(c, f) for f in SEARCH_FIELDS]
+            for tok in tokenize(" ".join(texts)):
+                postings.setdefault(tok, set()).add(n)
+        self.postings: Dict[str, List[int]] = {tok: sorted(ns) for tok, ns in postings.items()}
+        self.vocab: List[str] = sorted(self.postings)
+        # Trigrammes des tokens (déjà repliés) -> numéros dans vocab
+        self.word_grams: List[int] = []
+        grams: Dict[str, List[int]] = {}
+        for w, tok in enumerate(self.vocab):
+            tok_grams = trigrams(tok)
+            self.word_grams.append(len(tok_grams))
+            for g in tok_grams:
+                grams.setdefault(g, []).append(w)
+        self.grams = grams
+
+    def _prefix(self, prefix: str) -> Set[int]:
+        lo = bisect_left(self.vocab, prefix)
+        hi = bisect_left(self.vocab, prefix + "\uffff")
+        out: Set[int] = set()
+        for tok in self.vocab[lo:hi]:
+            out.update(self.postings[tok])
+        return out
+
+    def match(self, query: str) -> List[int]:
+        """Numéros des entrées dont chaque mot de la requête préfixe un token."""
+        hits: Optional[Set[int]] = None
+        for word in tokenize(query):
+            found = self._prefix(word)
+            hits = found if hits is None else hits & found
+            if not hits:
+                return []
+        return sorted(hits) if hits else []
+
+    def search(self, query: str) -> List[SearchEntry]:
+        return [self.entries[n] for n in self.match(query)]
+
+    def _similar_words(self, word: str, threshold: float) -> Dict[int, float]:
+        """Tokens proches de ``word`` (similarité trigrammes, 1.0 si préfixe)."""
+        q_grams = trigrams(word)
+        shared: Dict[int, int] = {}
+        for g in q_grams:
+            for w in self.grams.get(g, ()):
+                shared[w] = shared.get(w, 0) + 1
+        out: Dict[int, float] = {}
+        for w, n in shared.items():
+            sim = n / (len(q_grams) + self.word_grams[w] - n)
+            if sim >= threshold:
+                out[w] = sim
+        lo = bisect_left(self.vocab, word)
+        hi = bisect_left(self.vocab, word + "\uffff")
+        for w in range(lo, hi):
+            out[w] = 1.0
+        return out
+
+    def fuzzy_match(self, query: str, threshold: float = FUZZY_THRESHOLD) -> List[Tuple[int, float]]:
+        """(numéro d'entrée, score) triés par score décroissant.
+
+        Chaque mot de la requête doit correspondre (même approximativement)
+        à un token de l'entrée ; le score est la moyenne des meilleures
+        similarités par mot.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        scores: Optional[Dict[int, float]] = None
+        for word in words:
+            best: Dict[int, float] = {}
+            for w, sim in self._similar_words(word, threshold).items():
+                for n in self.postings[self.vocab[w]]:
+                    if sim > best.get(n, 0.0):
+                        best[n] = sim
+            if scores is None:
+                scores = best
+            else:
+                scores = {n: sc + best[n] for n, sc in scores.items() if n in best}
+            if not scores:
+                return []
+        ranked = sorted(scores.items(), key=lambda x: (-x[1], x[0]))
+        return [(n, sc / len(words)) for n, sc in ranked]
+
+    def fuzzy_search(self, query: str, threshold: float = FUZZY_THRESHOLD) -> List[SearchEntry]:
+        return [self.entries[n] for n, _sc in self.fuzzy_match(query, threshold)]
+
+
+def build_search_index(week_index: WeekIndex) -> SearchIndex:
+    return SearchIndex([c for w in sorted(week_index) for c in week_index[w]])
+
+# =========================
+# REGISTRE des facultés : CSV (SOURCES) ou module faculties/<slug>.py
+# =========================
+FileSignature = Tuple[int, int]
+PLUGIN_PACKAGE = "faculties"
+
+
+class FacultyLoader(NamedTuple):
+    load: Callable[[], Weeks]
+    signature: Callable[[], FileSignature]  # change => rechargement à chaud
+
+
+_LOADERS: Dict[str, FacultyLoader] = {}
+
+
+def _file_signature(fac: str) -> FileSignature:
+    src = SOURCES.get(fac)
+    if src is None:
+        return (0, 0)
+    try:
+        stt = os.stat(os.path.join(DATA_DIR, src.filename))
+        return (stt.st_mtime_ns, stt.st_size)
+    except OSError:
+        return (0, 0)
+
+
+def _no_signature() -> FileSignature:
+    return (0, 0)
+
+
+def register_faculty(name: str, load: Callable[[], Weeks],
+                     signature: Optional[Callable[[], FileSignature]] = None):
+    """Ajoute (ou remplace) une faculté ; elle n'est chargée qu'à sa première demande."""
+    _LOADERS[name] = FacultyLoader(load, signature or _no_signature)
+    if name not in FACULTIES:
+        FACULTIES.append(name)
+
+
+def plugin_module_name(fac: str) -> str:
+    return f"{PLUGIN_PACKAGE}.{re.sub(r'[^a-z0-9]+', '_', fac.lower()).strip('_')}"
+
+
+def faculty_loader(fac: str) -> FacultyLoader:
+    """Chargeur enregistré, sinon CSV de SOURCES, sinon module faculties/<slug>.py
+    (importé seulement maintenant), sinon faculté vide."""
+    loader = _LOADERS.get(fac)
+    if loader is not None:
+        return loader
+    if fac in SOURCES:
+        loader = FacultyLoader(lambda: load_faculty(fac), lambda: _file_signature(fac))
+    else:
+        try:
+            module = importlib.import_module(plugin_module_name(fac))
+        except ModuleNotFoundError:
+            module = None
+        if module is not None and hasattr(module, "load"):
+            loader = FacultyLoader(module.load, getattr(module, "signature", _no_signature))
+        else:
+            loader = FacultyLoader(dict, _no_signature)
+    _LOADERS[fac] = loader
+    return loader
+
+
+# =========================
+# CATALOGUE partagé : chargement paresseux + rechargement à chaud par faculté
+# =========================
+class FacultyIndex(NamedTuple):
+    by_week: WeekIndex
+    weeks: List[int]              # semaines remplies, triées
+    by_day: DayIndex
+    days: List[int]               # ordinaux indexés, triés (bisect)
+    search: SearchIndex
+    signature: FileSignature      # empreinte de la source au chargement
+
+
+def build_faculty_index(fac: str, weeks: Weeks, signature: FileSignature) -> FacultyIndex:
+    # Ordre à date égale : matières par fréquence dans la faculté
+    subjects = subjects_sorted_by_frequency({fac: weeks})
+    by_week = build_week_index(fac, weeks, subjects)
+    by_day = build_day_index(by_week)
+    weeks = sorted(w for w, courses in by_week.items() if courses)
+    return FacultyIndex(by_week, weeks, by_day, sorted(by_day), build_search_index(by_week), signature)
+
+
+def load_faculty_index(fac: str) -> FacultyIndex:
+    loader = faculty_loader(fac)
+    signature = loader.signature()
+    return build_faculty_index(fac, loader.load(), signature)
+
+
+class Catalog:
+    """Registre paresseux des facultés, partagé par toutes les sessions.
+
+    Une faculté n'est chargée (CSV/cache ou module) qu'à sa première
+    demande, puis conservée. Chaque ``FacultyIndex`` est immuable : un
+    rechargement en construit un nouveau et remplace l'entrée du registre
+    en une affectation, les sessions en cours gardent l'ancien sans verrou.
+    """
+
+    def __init__(self):
+        self._indexes: Dict[str, FacultyIndex] = {}
+        self._lock = threading.Lock()
+
+    def index(self, fac: str) -> FacultyIndex:
+        fi = self._indexes.get(fac)
+        if fi is None:
+            with self._lock:
+                fi = self._indexes.get(fac)
+                if fi is None:
+                    fi = load_faculty_index(fac)
+                    self._indexes[fac] = fi
+        return fi
+
+    def loaded(self) -> List[str]:
+        return list(self._indexes)
+
+    def refresh(self) -> List[str]:
+        """Recharge les facultés déjà chargées dont la source a changé."""
+        reloaded = []
+        with self._lock:
+            for fac, fi in list(self._indexes.items()):
+                loader = faculty_loader(fac)
+                signature = loader.signature()
+                if signature == fi.signature:
+                    continue
+                try:
+                    self._indexes[fac] = build_faculty_index(fac, loader.load(), signature)
+                    reloaded.append(fac)
+                except Exception:
+                    # Source invalide (ligne tronquée, fichier en cours d'écriture,
+                    # module en erreur…) : on garde l'ancienne version jusqu'à la
+                    # prochaine modification, et on vérifie les facultés suivantes
+                    self._indexes[fac] = fi._replace(signature=signature)
+        return reloaded
+
+    def weeks(self, fac: str) -> Dict[str, Dict[str, List[Course]]]:
+        """semaine (libellé) -> matière -> cours"""
+        out: Dict[str, Dict[str, List[Course]]] = {}
+        for w, courses in self.index(fac).by_week.items():
+            week_map = out.setdefault(week_label(w), {})
+            for c in courses:
+                week_map.setdefault(c.subject_name, []).append(c)
+        return out
+
+    @property
+    def data(self) -> Dict[str, Dict[str, Dict[str, List[Course]]]]:
+        """faculté -> semaine -> matière -> cours (charge toutes les facultés)"""
+        return {fac: self.weeks(fac) for fac in FACULTIES}
+
+    def populated_weeks(self, faculties: Optional[List[str]] = None) -> List[int]:
+        """Semaines ayant au moins un cours, triées."""
+        weeks: Set[int] = set()
+        for fac in faculties or FACULTIES:
+            weeks.update(self.index(fac).weeks)
+        return sorted(weeks)
+
+    def courses_in_week(self, fac: str, week: int) -> List[Course]:
+        return self.index(fac).by_week.get(week, [])
+
+    def courses_on(self, fac: str, d: date) -> List[Course]:
+        return self.index(fac).by_day.get(d.toordinal(), [])
+
+    def courses_in_weeks(self, fac: str, first: int, last: int) -> List[Tuple[int, List[Course]]]:
+        """Semaines remplies de [first, last] (clés ISO) avec leurs cours, par
+        bisection sur l'index : une passe, semaines vides ignorées."""
+        fi = self.index(fac)
+        lo = bisect_left(fi.weeks, first)
+        hi = bisect_right(fi.weeks, last)
+        return [(w, fi.by_week[w]) for w in fi.weeks[lo:hi]]
+
+    def courses_between(self, start: date, end_included: date,
+                        faculties: Optional[List[str]] = None) -> Dict[str, List[Course]]:
+        """Cours de [start, end_included] par faculté, sans parcourir les semaines."""
+        out: Dict[str, List[Course]] = {}
+        for fac in faculties or FACULTIES:
+            fi = self.index(fac)
+            lo = bisect_left(fi.days, start.toordinal())
+            hi = bisect_right(fi.days, end_included.toordinal())
+            out[fac] = [c for d in fi.days[lo:hi] for c in fi.by_day[d]]
+        return out
+
+    def search(self, query: str, faculties: Optional[List[str]] = None) -> List[SearchEntry]:
+        """Recherche exacte (préfixes), ordre des colonnes."""
+        return [e for fac in faculties or FACULTIES for e in self.index(fac).search.search(query)]
+
+    def fuzzy_search(self, query: str, faculties: Optional[List[str]] = None) -> List[SearchEntry]:
+        """Recherche approchée, facultés confondues, par score décroissant."""
+        scored = []
+        for rank, fac in enumerate(faculties or FACULTIES):
+            fi = self.index(fac)
+            scored.extend((-sc, rank, n, fi.search.entries[n]) for n, sc in fi.search.fuzzy_match(query))
+        scored.sort(key=lambda x: x[:3])
+        return [e for *_k, e in scored]
+
+
+CHECK_INTERVAL = 2.0  # secondes entre deux vérifications des sources
+
+_CATALOG = Catalog()
+_LAST_CHECK = 0.0
+
+
+def get_catalog() -> Catalog:
+    """Catalogue partagé par toutes les sessions. Ne pas le modifier.
+
+    Les sources des facultés chargées sont vérifiées (mtime/taille) au plus
+    toutes les ``CHECK_INTERVAL`` secondes ; seules celles qui ont changé
+    sont rechargées, sans redémarrage.
+    """
+    global _LAST_CHECK
+    now = time.monotonic()
+    if now - _LAST_CHECK >= CHECK_INTERVAL:
+        _LAST_CHECK = now
+        _CATALOG.refresh()
+    return _CATALOG
@@ -0,0 +1,7 @@
+"""Facultés supplémentaires, chargées à la demande par catalog.faculty_loader.
+
+Un module ``faculties/<slug>.py`` (slug du nom : "USPN" -> uspn) fournit
+``load()`` -> semaine -> matière -> cours, et optionnellement
+``signature()`` dont le changement déclenche un rechargement à chaud.
+Il n'est importé que lorsque la faculté est affichée pour la première fois.
+"""
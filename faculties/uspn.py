@@ -0,0 +1,6 @@
+"""USPN — emploi du temps pas encore publié (colonne vide)."""
+from typing import Dict, List
+
+
+def load() -> Dict[str, Dict[str, List[Dict]]]:
+    return {}
@@ -0,0 +1,331 @@
+"""Progression des fiches : encodage compact pour le cookie / localStorage,
+suivi par session et correctifs (deltas) envoyés au navigateur.
+
+Chaque clé de progression (``cards.make_key``) reçoit un ordinal stable dans
+un dictionnaire append-only (data/progress_ids.txt, à versionner avec le
+code). La progression devient un bitset sur ces ordinaux, compressé puis
+encodé en base64url :
+
+    p1.<n>.<crc>.<données>
+
+``n`` est la taille du dictionnaire à l'encodage et ``crc`` le CRC32 de ses
+``n`` premières clés : un dictionnaire plus récent (plus long) relit les
+anciennes valeurs, un dictionnaire divergent est détecté. L'ancien format
+(JSON ``{clé: bool}``) est toujours lu et migré.
+
+Le serveur ne modifie jamais le dictionnaire (fichier versionné, réinitialisé
+à chaque déploiement) : les clés d'un nouveau CSV y sont ajoutées par
+``python progress.py`` (avertissement dans les logs du serveur tant qu'elles
+manquent). Le serveur relit le fichier quand il change, au rythme des
+rechargements du catalogue : pas besoin de redémarrer.
+
+    python progress.py            # ajoute les clés du catalogue (ordre déterministe)
+    python progress.py --check    # code de sortie 1 si des clés manquent (CI)
+"""
+import base64
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from cards import make_key
+from catalog import CHECK_INTERVAL, DATA_DIR, FACULTIES, Catalog, Course, week_label
+
+FORMAT = "p1"
+IDS_PATH = os.path.join(DATA_DIR, "progress_ids.txt")
+
+log = logging.getLogger(__name__)
+
+
+def course_key(fac: str, c: Course) -> str:
+    """Clé de progression d'un cours (identique aux clés des cases à cocher)."""
+    return make_key(fac, c.subject_name, week_label(c.week), c.id or c.title)
+
+
+# =========================
+# DICTIONNAIRE
+# =========================
+class KeyDictionary:
+    """Clé de progression -> ordinal, append-only (les ordinaux ne changent jamais)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._keys: List[str] = []
+        self._ordinals: Dict[str, int] = {}
+        self._crc: List[int] = [0]       # _crc[n] : CRC32 des n premières clés
+        self._checked: Optional[Tuple] = None
+        self._signature: Tuple[int, int] = (0, 0)
+        self._lock = threading.Lock()
+        self.refresh()
+
+    def _file_signature(self) -> Tuple[int, int]:
+        try:
+            stt = os.stat(self.path)
+            return (stt.st_mtime_ns, stt.st_size)
+        except OSError:
+            return (0, 0)
+
+    def refresh(self) -> int:
+        """Relit le fichier s'il a changé (mtime/taille) ; renvoie le nombre de
+        clés ajoutées. Append-only : un fichier dont le début diffère des clés
+        déjà chargées est ignoré (les ordinaux en cours restent valables)."""
+        signature = self._file_signature()
+        if signature == self._signature:
+            return 0
+        with self._lock:
+            try:
+                with open(self.path, encoding="utf-8") as f:
+                    keys = [line.rstrip("\n") for line in f if line.strip()]
+            except OSError:
+                return 0
+            self._signature = signature
+            before = len(self._keys)
+            if keys[:before] != self._keys:
+                log.warning("%s : le début du fichier a changé (dictionnaire non "
+                            "append-only), ignoré jusqu'au redémarrage", self.path)
+                return 0
+            self._append(keys[before:])
+            self._checked = None
+            return len(self._keys) - before
+
+    def _append(self, keys: List[str]):
+        for k in keys:
+            if k in self._ordinals:
+                continue
+            self._ordinals[k] = len(self._keys)
+            self._keys.append(k)
+            self._crc.append(zlib.crc32(k.encode("utf-8") + b"\n", self._crc[-1]))
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def ordinal(self, key: str) -> Optional[int]:
+        return self._ordinals.get(key)
+
+    def key(self, ordinal: int) -> str:
+        return self._keys[ordinal]
+
+    def checksum(self, n: int) -> int:
+        return self._crc[n]
+
+    def missing(self, catalog: Catalog, faculties: Iterable[str]) -> List[str]:
+        """Clés du catalogue absentes du dictionnaire : triées par faculté, dans
+        l'ordre des facultés données (ordre d'ajout indépendant du chargement)."""
+        out: List[str] = []
+        for fac in faculties:
+            keys = {course_key(fac, c) for courses in catalog.index(fac).by_week.values()
+                    for c in courses}
+            out.extend(sorted(k for k in keys if k not in self._ordinals))
+        return out
+
+    def extend(self, keys: List[str]):
+        """Ajoute des clés en fin de fichier (outil de déploiement uniquement)."""
+        with self._lock:
+            new = [k for k in dict.fromkeys(keys) if k not in self._ordinals]
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.writelines(k + "\n" for k in new)
+            self._append(new)
+
+    def check(self, catalog: Catalog):
+        """Signale (logs) les clés des facultés chargées absentes du dictionnaire,
+        une fois par version du catalogue ; le fichier n'est pas modifié."""
+        facs = catalog.loaded()
+        state = tuple((fac, catalog.index(fac).signature) for fac in facs)
+        if state == self._checked:
+            return
+        self._checked = state
+        missing = self.missing(catalog, facs)
+        if missing:
+            log.warning("%s : %d clés de progression absentes (ex. %s), cases pas "
+                        "encore enregistrées dans le navigateur ; lancer « python "
+                        "progress.py » (relu sans redémarrage)", self.path, len(missing), missing[0])
+
+
+_DICTIONARY: Optional[KeyDictionary] = None
+_DICTIONARY_LOCK = threading.Lock()
+_LAST_CHECK = 0.0
+
+def get_dictionary(catalog: Catalog) -> KeyDictionary:
+    """Dictionnaire du processus (lecture seule), relu quand le fichier change
+    (au plus toutes les ``CHECK_INTERVAL`` secondes, comme le catalogue) et
+    vérifié contre le catalogue courant."""
+    global _DICTIONARY, _LAST_CHECK
+    now = time.monotonic()
+    with _DICTIONARY_LOCK:
+        if _DICTIONARY is None:
+            _DICTIONARY = KeyDictionary(IDS_PATH)
+            _LAST_CHECK = now
+        elif now - _LAST_CHECK >= CHECK_INTERVAL:
+            _LAST_CHECK = now
+            _DICTIONARY.refresh()
+    _DICTIONARY.check(catalog)
+    return _DICTIONARY
+
+
+# =========================
+# ENCODAGE
+# =========================
+def _b64url(data: bytes) -> str:
+    return base64.urlsafe_b64encode(data).decode("ascii").rstrip("=")
+
+def _unb64url(s: str) -> bytes:
+    return base64.urlsafe_b64decode(s + "=" * (-len(s) % 4))
+
+
+def encode_progress(done_keys: Iterable[str], dictionary: KeyDictionary) -> str:
+    """Clés cochées -> ``p1.<n>.<crc>.<bitset>`` (clés hors dictionnaire ignorées,
+    voir ``KeyDictionary.check``)."""
+    n = len(dictionary)
+    bits = bytearray((n + 7) // 8)
+    for k in done_keys:
+        o = dictionary.ordinal(k)
+        if o is not None:
+            bits[o >> 3] |= 1 << (o & 7)
+    data = zlib.compress(bytes(bits).rstrip(b"\0"), 9)
+    return f"{FORMAT}.{n}.{dictionary.checksum(n):08x}.{_b64url(data)}"
+
+
+def decode_progress(raw: Optional[str], dictionary: KeyDictionary) -> Dict[str, bool]:
+    """Valeur du cookie / localStorage -> {clé: True} ; lit aussi l'ancien JSON."""
+    raw = (raw or "").strip()
+    if not raw:
+        return {}
+    if raw.startswith("{"):  # ancien format : {clé: bool}
+        try:
+            legacy = json.loads(raw)
+        except ValueError:
+            return {}
+        if not isinstance(legacy, dict):
+            return {}
+        return {k: True for k, v in legacy.items()
+                if v and isinstance(k, str) and k.startswith("ds::")}
+    try:
+        fmt, n, crc, data = raw.split(".", 3)
+        n = int(n)
+        if fmt != FORMAT or n > len(dictionary) or int(crc, 16) != dictionary.checksum(n):
+            return {}  # dictionnaire divergent : illisible plutôt que faux
+        # Taille bornée par le dictionnaire (valeur venue du navigateur)
+        bits = zlib.decompressobj().decompress(_unb64url(data), (n + 7) // 8)
+    except (ValueError, zlib.error):
+        return {}
+    return {
+        dictionary.key(i * 8 + b): True
+        for i, byte in enumerate(bits) if byte
+        for b in range(8) if byte >> b & 1 and i * 8 + b < n
+    }
+
+
+def is_current(raw: Optional[str], dictionary: KeyDictionary) -> bool:
+    """Valeur au format courant et compatible avec le dictionnaire (un correctif
+    peut alors s'y appliquer dans le navigateur sans renvoyer l'état complet)."""
+    try:
+        fmt, n, crc, _data = (raw or "").strip().split(".", 3)
+        return fmt == FORMAT and int(n) <= len(dictionary) and int(crc, 16) == dictionary.checksum(int(n))
+    except ValueError:
+        return False
+
+
+# =========================
+# SUIVI PAR SESSION + CORRECTIFS
+# =========================
+class ProgressTracker:
+    """Cases cochées d'une session et modifications pas encore envoyées.
+
+    Indépendant des widgets : Streamlit efface l'état des cases qui ne sont
+    pas affichées dans un rerun (autres semaines, pages suivantes).
+    File d'écriture : les modifications d'une même clé fusionnent et partent en
+    un correctif par rerun (« Tout cocher » compris) ; le navigateur diffère
+    ensuite l'écriture du cookie.
+    """
+
+    def __init__(self, done: Iterable[str] = ()):
+        self.done: Set[str] = set(done)
+        self.pending: Dict[str, bool] = {}   # clé -> dernier état (fusionné)
+        self.full = False                    # prochain envoi : état complet
+        self.hold = False                    # valeur du navigateur illisible : rien n'est envoyé
+        self.seq = 0                         # numéro du dernier correctif
+
+    def is_done(self, key: str) -> bool:
+        return key in self.done
+
+    def set(self, key: str, value: bool):
+        if value:
+            self.done.add(key)
+        else:
+            self.done.discard(key)
+        self.pending[key] = bool(value)
+
+    def update(self, keys: Iterable[str], value: bool):
+        for k in keys:
+            self.set(k, value)
+
+    def merge(self, done: Iterable[str]):
+        """Ajoute un état chargé après coup, sans écraser les clics déjà faits."""
+        self.done.update(k for k in done if k not in self.pending)
+
+    def reset(self, done: Iterable[str]):
+        """Remplace tout l'état ; le navigateur recevra l'état complet."""
+        self.done = set(done)
+        self.pending.clear()
+        self.full = True
+
+    def hold_patches(self):
+        """Valeur du navigateur illisible (dictionnaire divergent) : elle est laissée
+        intacte, les modifications restent dans la session au lieu de l'écraser."""
+        self.hold = True
+
+    def has_pending(self) -> bool:
+        return self.full or bool(self.pending)
+
+    def take_patch(self, dictionary: KeyDictionary) -> Optional[str]:
+        """Correctif JSON des modifications en attente, ou None si rien à envoyer.
+        Les clés pas encore dans le dictionnaire restent en attente : elles
+        partiront quand le fichier relu les contiendra."""
+        if self.hold or not self.has_pending():
+            return None
+        known = {k: v for k, v in self.pending.items() if dictionary.ordinal(k) is not None}
+        if not self.full and not known:
+            return None
+        self.seq += 1
+        if self.full:
+            patch = encode_patch(self.seq, dict.fromkeys(self.done, True), dictionary, full=True)
+        else:
+            patch = encode_patch(self.seq, known, dictionary)
+        self.pending = {k: v for k, v in self.pending.items() if k not in known}
+        self.full = False
+        return patch
+
+
+def encode_patch(seq: int, changes: Dict[str, bool], dictionary: KeyDictionary,
+                 full: bool = False) -> str:
+    """``{"seq", "n", "crc", "set", "clear", "full"}`` sur les ordinaux : appliqué
+    par le navigateur au bitset stocké (``full`` : repartir d'un bitset vide)."""
+    n = len(dictionary)
+    on, off = [], []
+    for k, v in changes.items():
+        o = dictionary.ordinal(k)
+        if o is not None:
+            (on if v else off).append(o)
+    return json.dumps({"seq": seq, "n": n, "crc": f"{dictionary.checksum(n):08x}",
+                       "set": sorted(on), "clear": sorted(off), "full": full},
+                      separators=(",", ":"))
+
+
+if __name__ == "__main__":
+    from catalog import get_catalog
+
+    d = KeyDictionary(IDS_PATH)
+    missing = d.missing(get_catalog(), FACULTIES)
+    if "--check" in sys.argv[1:]:
+        if missing:
+            print(f"ERREUR : {len(missing)} clés absentes de {IDS_PATH}, ex. {missing[:3]} "
+                  f"(lancer « python progress.py »)")
+            sys.exit(1)
+        print(f"{IDS_PATH} : {len(d)} clés, à jour")
+    else:
+        d.extend(missing)
+        print(f"{IDS_PATH} : {len(d)} clés ({len(missing)} ajoutées)")
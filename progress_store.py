@@ -0,0 +1,285 @@
+"""Stockage serveur de la progression (par utilisateur), interchangeable.
+
+Le navigateur (cookie + localStorage) garde une copie locale. Un appareil
+(navigateur) vu pour la première fois fusionne sa copie avec le stockage ;
+ensuite le stockage fait foi, ce qui permet de changer d'appareil et
+d'agréger la progression de l'équipe.
+
+Sans authentification (cas par défaut), l'utilisateur est l'identifiant
+aléatoire du navigateur (cookie ds_user) : la progression ne suit pas
+d'elle-même sur un autre appareil. L'application affiche ce « code de
+synchronisation » ; le saisir sur l'autre appareil y adopte le même
+utilisateur. Le code donne accès à la progression : à ne pas diffuser.
+
+Choix du stockage : variable d'environnement ``DS_PROGRESS_BACKEND``
+(``sqlite`` par défaut, ``browser`` pour s'en passer) ; autres stockages via
+``register_backend``. Base SQLite : ``DS_PROGRESS_DB`` (défaut
+data/progress.sqlite3).
+"""
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from catalog import DATA_DIR
+
+log = logging.getLogger(__name__)
+
+
+class ProgressBackend:
+    """Interface : ``load`` est appelé une fois par session ; ni lui ni les
+    écritures ne doivent bloquer le rerun (elles peuvent être différées)."""
+
+    def load(self, user: str) -> Optional[Set[str]]:
+        """Clés cochées de l'utilisateur (écritures en attente comprises), ou
+        None s'il est inconnu."""
+        raise NotImplementedError
+
+    def write(self, user: str, changes: Dict[str, bool]):
+        """Enregistre des modifications {clé: état}."""
+        raise NotImplementedError
+
+    def replace(self, user: str, done: Iterable[str]):
+        """Remplace tout l'état de l'utilisateur (amorçage, migration)."""
+        raise NotImplementedError
+
+    def register_device(self, user: str, device: str) -> bool:
+        """Enregistre l'appareil ; True s'il était déjà connu pour l'utilisateur
+        (sa copie locale a déjà été fusionnée)."""
+        raise NotImplementedError
+
+    def flush(self):
+        """Attend la fin des écritures en cours."""
+
+
+class BrowserOnlyBackend(ProgressBackend):
+    """Aucun stockage serveur : la progression reste dans le navigateur."""
+
+    def load(self, user: str) -> Optional[Set[str]]:
+        return None
+
+    def write(self, user: str, changes: Dict[str, bool]):
+        pass
+
+    def replace(self, user: str, done: Iterable[str]):
+        pass
+
+    def register_device(self, user: str, device: str) -> bool:
+        return True
+
+
+# =========================
+# SQLITE (WAL)
+# =========================
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS users (
+    user    TEXT PRIMARY KEY,
+    created REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS progress (
+    user    TEXT NOT NULL,
+    course  TEXT NOT NULL,        -- clé de progression (cards.make_key)
+    updated REAL NOT NULL,
+    PRIMARY KEY (user, course)    -- index (utilisateur, cours)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS devices (
+    user    TEXT NOT NULL,
+    device  TEXT NOT NULL,        -- cookie ds_device du navigateur
+    created REAL NOT NULL,
+    PRIMARY KEY (user, device)
+) WITHOUT ROWID;
+"""
+
+# Opérations de la file : ("write", user, {clé: état}) | ("replace", user, clés)
+# | ("device", user, appareil)
+Op = Tuple[str, str, object]
+
+
+class SQLiteBackend(ProgressBackend):
+    """SQLite en mode WAL : lectures concurrentes sans bloquer l'écrivain.
+
+    Un seul thread écrit : il vide la file d'un coup (toutes sessions
+    confondues) et applique le lot dans une transaction (upserts / suppressions
+    groupés). Une ligne = une fiche faite ; décocher supprime la ligne.
+    Un lot refusé par la base (verrou, disque plein…) est retenté avec une
+    attente croissante ; seule une erreur imprévue (journalisée) fait abandonner
+    un lot, sans arrêter l'écrivain. Les opérations pas encore écrites
+    restent visibles par utilisateur : ``load`` les superpose à la base au
+    lieu d'attendre l'écrivain (les écritures des autres sessions ne le
+    retardent pas).
+    """
+
+    BATCH_WINDOW = 0.05  # secondes d'attente pour grouper les écritures
+    RETRY_DELAY = 0.5    # première attente après un échec (doublée, plafonnée)
+    RETRY_MAX_DELAY = 30.0
+
+    def __init__(self, path: str):
+        self.path = path
+        self._queue: "queue.Queue[Optional[Op]]" = queue.Queue()
+        self._unsaved: Dict[str, List[Op]] = {}   # utilisateur -> opérations en file
+        self._unsaved_lock = threading.Lock()
+        with self._connect() as db:
+            db.execute("PRAGMA journal_mode=WAL")
+            db.executescript(_SCHEMA)
+        # Une connexion de lecture partagée (sous _unsaved_lock) : chaque rerun
+        # Streamlit tourne dans un nouveau thread, une connexion par thread ne
+        # serait jamais réutilisée
+        self._read_db = self._connect()
+        self._writer = threading.Thread(target=self._run, name="progress-writer", daemon=True)
+        self._writer.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        db = sqlite3.connect(self.path, timeout=5.0, check_same_thread=False)
+        db.execute("PRAGMA synchronous=NORMAL")
+        return db
+
+    def load(self, user: str) -> Optional[Set[str]]:
+        # Base + opérations en file de cet utilisateur (rechargement de page) ;
+        # le verrou empêche l'écrivain de les retirer entre les deux lectures
+        with self._unsaved_lock:
+            db = self._read_db
+            known = db.execute("SELECT 1 FROM users WHERE user = ?", (user,)).fetchone() is not None
+            done = {row[0] for row in db.execute("SELECT course FROM progress WHERE user = ?", (user,))}
+            ops = list(self._unsaved.get(user, ()))
+        for kind, _user, payload in ops:
+            if kind == "replace":
+                known, done = True, set(payload)
+            elif kind == "write":
+                known = True
+                done.update(k for k, v in payload.items() if v)
+                done.difference_update(k for k, v in payload.items() if not v)
+        return done if known else None
+
+    def _put(self, op: Op):
+        with self._unsaved_lock:
+            self._unsaved.setdefault(op[1], []).append(op)
+        self._queue.put(op)
+
+    def write(self, user: str, changes: Dict[str, bool]):
+        if changes:
+            self._put(("write", user, dict(changes)))
+
+    def replace(self, user: str, done: Iterable[str]):
+        self._put(("replace", user, list(done)))
+
+    def register_device(self, user: str, device: str) -> bool:
+        with self._unsaved_lock:
+            known = self._read_db.execute("SELECT 1 FROM devices WHERE user = ? AND device = ?",
+                               (user, device)).fetchone() is not None
+            known = known or ("device", user, device) in self._unsaved.get(user, ())
+        if not known:
+            self._put(("device", user, device))
+        return known
+
+    def flush(self):
+        self._queue.join()
+
+    # Thread écrivain
+    def _run(self):
+        db = self._connect()
+        while True:
+            batch: List[Op] = [self._queue.get()]
+            time.sleep(self.BATCH_WINDOW)
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            delay = self.RETRY_DELAY
+            while True:
+                try:
+                    self._apply(db, batch)
+                    break
+                except sqlite3.Error:
+                    # Base indisponible : on garde le lot (plus ce qui arrive
+                    # entre-temps, dans l'ordre) et on réessaie
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.RETRY_MAX_DELAY)
+                    while True:
+                        try:
+                            batch.append(self._queue.get_nowait())
+                        except queue.Empty:
+                            break
+                    try:
+                        db.close()
+                        db = self._connect()
+                    except sqlite3.Error:
+                        pass
+                except Exception:
+                    # Erreur imprévue (donnée invalide…) : lot abandonné mais
+                    # l'écrivain continue, sinon la file et flush() resteraient bloqués
+                    log.exception("progression : lot de %d opérations abandonné", len(batch))
+                    break
+            with self._unsaved_lock:
+                for op in batch:  # lot écrit : la base fait foi (ordre FIFO)
+                    ops = self._unsaved[op[1]]
+                    ops.remove(op)
+                    if not ops:
+                        del self._unsaved[op[1]]
+            for _ in batch:
+                self._queue.task_done()
+
+    @staticmethod
+    def _apply(db: sqlite3.Connection, batch: List[Op]):
+        now = time.time()
+        # Dernier état par (utilisateur, clé) ; un remplacement efface ce qui précède
+        replaced: Set[str] = set()
+        state: Dict[Tuple[str, str], bool] = {}
+        devices: Set[Tuple[str, str]] = set()
+        for kind, user, payload in batch:
+            if kind == "device":
+                devices.add((user, payload))
+            elif kind == "replace":
+                replaced.add(user)
+                state = {k: v for k, v in state.items() if k[0] != user}
+                state.update(((user, key), True) for key in payload)
+            else:
+                state.update(((user, key), v) for key, v in payload.items())
+        users = replaced | {user for user, _key in state}
+        with db:  # une transaction par lot
+            db.executemany("INSERT OR IGNORE INTO users (user, created) VALUES (?, ?)",
+                           [(u, now) for u in users])
+            db.executemany("DELETE FROM progress WHERE user = ?", [(u,) for u in replaced])
+            db.executemany(
+                "INSERT INTO progress (user, course, updated) VALUES (?, ?, ?) "
+                "ON CONFLICT (user, course) DO UPDATE SET updated = excluded.updated",
+                [(u, k, now) for (u, k), v in state.items() if v],
+            )
+            db.executemany("DELETE FROM progress WHERE user = ? AND course = ?",
+                           [(u, k) for (u, k), v in state.items() if not v])
+            db.executemany("INSERT OR IGNORE INTO devices (user, device, created) VALUES (?, ?, ?)",
+                           [(u, d, now) for u, d in devices])
+
+
+# =========================
+# REGISTRE
+# =========================
+DB_PATH = os.environ.get("DS_PROGRESS_DB", os.path.join(DATA_DIR, "progress.sqlite3"))
+
+_BACKENDS: Dict[str, Callable[[], ProgressBackend]] = {
+    "sqlite": lambda: SQLiteBackend(DB_PATH),
+    "browser": BrowserOnlyBackend,
+}
+
+def register_backend(name: str, factory: Callable[[], ProgressBackend]):
+    """Déclare un stockage (ex. base partagée) sélectionnable par DS_PROGRESS_BACKEND."""
+    _BACKENDS[name] = factory
+
+
+_BACKEND: Optional[ProgressBackend] = None
+_BACKEND_LOCK = threading.Lock()
+
+def get_backend() -> ProgressBackend:
+    """Stockage du processus (créé à la première demande)."""
+    global _BACKEND
+    with _BACKEND_LOCK:
+        if _BACKEND is None:
+            name = os.environ.get("DS_PROGRESS_BACKEND", "sqlite")
+            try:
+                _BACKEND = _BACKENDS[name]()
+            except (KeyError, OSError, sqlite3.Error):
+                _BACKEND = BrowserOnlyBackend()
+        return _BACKEND
@@ -0,0 +1,150 @@
+"""Vues non personnalisées, partagées par toutes les sessions du processus.
+
+Tout ce qui ne dépend que des paramètres d'affichage (cours filtrés d'une
+colonne, clés de progression, HTML statique) est calculé une fois ; chaque
+session n'y superpose que l'état de ses cases (``st.session_state``).
+"""
+import html
+import threading
+from collections import OrderedDict
+from datetime import date
+from functools import lru_cache
+from typing import Callable, Generic, Hashable, NamedTuple, Optional, Tuple, TypeVar
+
+from cards import make_key
+from catalog import FACULTY_IDS, Catalog, Course, week_key, week_label
+
+V = TypeVar("V")
+
+
+# =========================
+# CACHE LRU
+# =========================
+class LRUCache(Generic[V]):
+    """LRU borné en nombre d'entrées et en poids cumulé (ex. nombre de cours).
+
+    Thread-safe ; la construction d'une valeur se fait hors verrou (deux
+    sessions peuvent calculer la même vue, la seconde écrase la première).
+    """
+
+    def __init__(self, max_entries: int, max_weight: int):
+        self.max_entries = max_entries
+        self.max_weight = max_weight
+        self._items: "OrderedDict[Hashable, Tuple[V, int]]" = OrderedDict()
+        self._weight = 0
+        self._lock = threading.Lock()
+        self.hits = self.misses = 0
+
+    def get_or_build(self, key: Hashable, build: Callable[[], V],
+                     weight: Callable[[V], int] = lambda v: 1) -> V:
+        with self._lock:
+            item = self._items.get(key)
+            if item is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return item[0]
+            self.misses += 1
+        value = build()
+        w = weight(value)
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._weight -= old[1]
+            self._items[key] = (value, w)
+            self._weight += w
+            while self._items and (len(self._items) > self.max_entries or self._weight > self.max_weight):
+                _k, (_v, ow) = self._items.popitem(last=False)
+                self._weight -= ow
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._weight = 0
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+# =========================
+# COLONNES
+# =========================
+class ViewParams(NamedTuple):
+    """Paramètres d'affichage d'une colonne (hors progression de l'utilisateur)."""
+    fac: str
+    first_week: int               # clés ISO YYYYWW, bornes incluses
+    last_week: int
+    day: Optional[date]           # date précise, sinon None
+    query: str
+    season: bool                  # recherche sur toute la saison
+    fuzzy: bool
+
+
+class ColumnView(NamedTuple):
+    courses: Tuple[Course, ...]   # regroupés par semaine, dans l'ordre chronologique
+    keys: Tuple[str, ...]         # clés de progression (make_key), même ordre
+
+
+MAX_VIEWS = 2048          # entrées (faculté x semaine(s) x filtres)
+MAX_VIEW_COURSES = 200_000  # cours cumulés sur toutes les vues en cache
+
+_VIEWS: LRUCache[ColumnView] = LRUCache(MAX_VIEWS, MAX_VIEW_COURSES)
+
+
+def _build_column(catalog: Catalog, p: ViewParams) -> ColumnView:
+    # Cours déjà triés (index précalculés, entiers : faculté, semaine, jour)
+    if p.query:
+        first, last = (week_key(p.day),) * 2 if p.day else (p.first_week, p.last_week)
+        target_day = p.day.toordinal() if p.day else None
+        hits = catalog.fuzzy_search(p.query, [p.fac]) if p.fuzzy else catalog.search(p.query, [p.fac])
+        fac_id = FACULTY_IDS.id(p.fac)
+        courses = [
+            c for c in hits
+            if c.faculty == fac_id
+            and (p.season or first <= c.week <= last)
+            and (target_day is None or (c.has_date and c.ordinal == target_day))
+        ]
+        # Regroupés par semaine (tri stable : l'ordre des résultats, ex. score
+        # de similarité, est conservé dans chaque semaine)
+        courses.sort(key=lambda c: c.week)
+    elif p.day:
+        courses = catalog.courses_on(p.fac, p.day)
+    elif p.first_week == p.last_week:
+        courses = catalog.courses_in_week(p.fac, p.first_week)
+    else:
+        # Période : semaines remplies de l'intervalle, en une passe sur l'index
+        courses = [c for _w, week in catalog.courses_in_weeks(p.fac, p.first_week, p.last_week)
+                   for c in week]
+    keys = tuple(make_key(p.fac, c.subject_name, week_label(c.week), c.id or c.title) for c in courses)
+    return ColumnView(tuple(courses), keys)
+
+
+def column_view(catalog: Catalog, p: ViewParams) -> ColumnView:
+    """Cours et clés d'une colonne, mis en cache pour tout le processus. La clé
+    inclut l'empreinte de la source : un rechargement à chaud invalide la vue."""
+    key = (p, catalog.index(p.fac).signature)
+    return _VIEWS.get_or_build(key, lambda: _build_column(catalog, p), lambda v: len(v.courses) or 1)
+
+
+# =========================
+# HTML STATIQUE
+# =========================
+@lru_cache(maxsize=64)
+def column_head_html(fac: str) -> str:
+    return f'<div class="table-head fac-head">{html.escape(fac)}</div>'
+
+
+@lru_cache(maxsize=8)
+def links_panel_html(blocks: Tuple[Tuple[str, str, str, str], ...]) -> str:
+    """Panneau de liens (titre, url, identifiant, mot de passe) en un seul bloc HTML."""
+    return "".join(
+        f"""
+        <div class="cell" style="margin-bottom:10px;">
+          <div style="font-weight:700">{title}</div>
+          <div class="mini"><a href="{url}" target="_blank">{url}</a></div>
+          <div class="mini">{login}</div>
+          <div class="mini">{pwd}</div>
+        </div>
+        """
+        for title, url, login, pwd in blocks
+    )